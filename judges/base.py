@@ -7,9 +7,10 @@ import subprocess
 import resource
 
 class BaseJudge(ABC):
-    def __init__(self, logger: Logger, language_extension: str):
+    def __init__(self, logger: Logger, language_extension: str, workdir: str = "temp"):
         self.logger = logger
         self.language_extension = language_extension
+        self.workdir = workdir
 
     @abstractmethod
     def compile_code(self, source_path: str, output_binary: str) -> bool:
@@ -6,8 +6,8 @@ from judges.base import BaseJudge
 from utils.resource_tracker import ResourceTracker
 
 class CppJudge(BaseJudge):
-    def __init__(self, logger: Logger):
-        super().__init__(logger, "cpp")
+    def __init__(self, logger: Logger, workdir: str = "temp"):
+        super().__init__(logger, "cpp", workdir)
 
     def compile_code(self, source_path: str, output_binary: str) -> bool:
         self.logger.log('info', f"Compiling {source_path} to {output_binary}")
@@ -8,8 +8,8 @@ import re
 import os
 
 class JavaJudge(BaseJudge):
-    def __init__(self, logger: Logger):
-        super().__init__(logger, "java")
+    def __init__(self, logger: Logger, workdir: str = "temp"):
+        super().__init__(logger, "java", workdir)
 
     def compile_code(self, source_path: str, output_binary: str) -> bool:
         self.logger.log('info', f"Compiling {source_path}")
@@ -28,7 +28,7 @@ class JavaJudge(BaseJudge):
 
         try:
             # Create a process to run the Java program
-            result = subprocess.run(['java', '-cp', 'temp', class_name], input=input_data, text=True,
+            result = subprocess.run(['java', '-cp', self.workdir, class_name], input=input_data, text=True,
                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                                     preexec_fn=lambda: tracker.set_limits(time_limit, memory_limit) if not ignore_time_limits else None, 
                                     timeout=None if ignore_time_limits else time_limit)
@@ -6,8 +6,8 @@ from utils.resource_tracker import ResourceTracker
 import subprocess
 
 class PythonJudge(BaseJudge):
-    def __init__(self, logger: Logger):
-        super().__init__(logger, "py")
+    def __init__(self, logger: Logger, workdir: str = "temp"):
+        super().__init__(logger, "py", workdir)
 
     def compile_code(self, source_path: str, output_binary: str) -> bool:
         return True
@@ -1,28 +1,32 @@
 import os
-import json
-import shutil
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
-from pydantic import ValidationError
+from msgspec import ValidationError
 from datasets import load_dataset
 from judges.cpp_judge import CppJudge
 from judges.python_judge import PythonJudge
 from judges.java_judge import JavaJudge
 from utils.logger import Logger, JSONLogger
-from utils.models import Problem, Config
-from utils.utils import sanitize_filename
-from providers.openai import OpenAIProvider
-from providers.huggingface import HuggingFaceProvider
-from providers.anthropic import AnthropicProvider
-from providers.mistral import MistralProvider
-from providers.google import GoogleProvider
-
-def load_problems_from_hf(dataset_name: str, split: str = 'train') -> list[str]:
+from utils.models import Problem, Config, parse_problem
+from utils.utils import sanitize_filename, json_loads, write_file_fast, remove_tree_fast
+
+def load_problems_from_hf(dataset_name: str, split: str = 'train') -> list[dict]:
     dataset = load_dataset(dataset_name, split=split)
-    return [json.dumps(problem) for problem in dataset]
+    # to_list converts the whole split from Arrow in one batched C-level pass
+    # instead of materializing a LazyRow per record in the Python loop.
+    return dataset.to_list()
+
+def make_temp_dir() -> str:
+    # Put sources and binaries on tmpfs when available so the write/compile/run
+    # churn never touches real disk; mkdtemp also keeps concurrent runs apart.
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    return tempfile.mkdtemp(prefix="cses_judge_", dir=base)
 
 def load_config(config_path: str) -> Config:
     with open(config_path, 'r') as file:
-        config_json = json.load(file)
+        config_json = json_loads(file.read())
     return Config(**config_json)
 
 def generate_summary(results: list[dict]) -> str:
@@ -30,108 +34,249 @@ def generate_summary(results: list[dict]) -> str:
     total_count = len(results)
     return f"Passed {passed_count}/{total_count} test cases"
 
-def load_existing_log(log_filename: str) -> dict:
-    if os.path.exists(log_filename):
-        with open(log_filename, 'r') as file:
-            return json.load(file)
-    return {}
+# The factories import lazily so only the selected provider's SDK is loaded;
+# importing all five (transformers in particular) costs seconds at startup.
+def _make_openai_provider(config: Config, logger: Logger):
+    from providers.openai import OpenAIProvider
+    return OpenAIProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
+
+def _make_huggingface_provider(config: Config, logger: Logger):
+    from providers.huggingface import HuggingFaceProvider
+    return HuggingFaceProvider(config.model, config.base_prompt, logger, config.language)
+
+def _make_anthropic_provider(config: Config, logger: Logger):
+    from providers.anthropic import AnthropicProvider
+    return AnthropicProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
+
+def _make_mistral_provider(config: Config, logger: Logger):
+    from providers.mistral import MistralProvider
+    return MistralProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
+
+def _make_google_provider(config: Config, logger: Logger):
+    from providers.google import GoogleProvider
+    return GoogleProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
+
+PROVIDER_REGISTRY = {
+    "openai": _make_openai_provider,
+    "huggingface": _make_huggingface_provider,
+    "anthropic": _make_anthropic_provider,
+    "mistral": _make_mistral_provider,
+    "google": _make_google_provider,
+}
 
 def initialize_provider(config: Config, logger: Logger):
-    if config.provider == "openai":
-        return OpenAIProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
-    elif config.provider == "huggingface":
-        return HuggingFaceProvider(config.model, config.base_prompt, logger, config.language)
-    elif config.provider == "anthropic":
-        return AnthropicProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
-    elif config.provider == "mistral":
-        return MistralProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
-    elif config.provider == "google":
-        return GoogleProvider(config.api_key, config.model, config.base_prompt, logger, config.language)
-    else:
+    factory = PROVIDER_REGISTRY.get(config.provider)
+    if factory is None:
         logger.log('error', "Invalid provider specified")
         raise ValueError("Invalid provider specified")
+    return factory(config, logger)
 
-def initialize_judge(language: str, logger: Logger):
-    if language == "cpp":
-        return CppJudge(logger)
-    elif language == "python":
-        return PythonJudge(logger)
-    elif language == "java":
-        return JavaJudge(logger)
-    else:
+# The judge classes stay eagerly imported - they only pull in the stdlib, so
+# the registry is just the lookup table, not a lazy-import shim.
+JUDGE_REGISTRY = {
+    "cpp": CppJudge,
+    "python": PythonJudge,
+    "java": JavaJudge,
+}
+
+def initialize_judge(language: str, logger: Logger, workdir: str = "temp"):
+    judge_cls = JUDGE_REGISTRY.get(language)
+    if judge_cls is None:
         logger.log('error', "Unsupported language specified")
         raise ValueError("Unsupported language specified")
+    return judge_cls(logger, workdir)
 
-def process_problem(judge, provider, problem_data: dict, shots: int, ignore_time_limits: bool, json_logger: JSONLogger, logger: Logger, problems_passed: int, total_filtered_problems: int, index: int) -> int:
-    problem_title = problem_data['title']
-    sanitized_title = sanitize_filename(problem_title)
+_problem_cache: dict[str, Problem] = {}
 
-    for shot in range(1, shots + 1):
-        solution = provider.generate_solution(problem_data)
-        if solution:
-            if isinstance(judge, JavaJudge):
-                try:
-                    class_name = judge.get_class_name(solution)
-                    source_file = os.path.join("temp", f"{class_name}.java")
-                    binary_file = os.path.join("temp", f"{class_name}.class")
-                except ValueError as e:
-                    logger.log('error', str(e))
-                    json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), solution, str(e), problems_passed, shot)
-                    continue
-            else:
-                source_file = os.path.join("temp", f"{sanitized_title}_shot_{shot}.{judge.language_extension}")
-                binary_file = os.path.join("temp", f"{sanitized_title}_binary_shot_{shot}")
+def validate_problem(problem_data: dict) -> Problem:
+    # Conversion parses the time/memory limits, so cache by title to pay it
+    # at most once per problem regardless of shots or resumed runs.
+    title = problem_data['title']
+    if title not in _problem_cache:
+        _problem_cache[title] = parse_problem(problem_data)
+    return _problem_cache[title]
 
-            with open(source_file, 'w') as file:
-                file.write(solution)
+def prepare_one_shot(judge, problem_data: dict, solution: str, shot: int, logger: Logger, compile_cache: dict = None, temp_dir: str = "temp") -> dict:
+    """Write and compile one solution; returns the artifacts the run stage needs.
 
+    Safe to call outside the run lock: it only touches this shot's own files
+    and logs through the (thread-safe) stream logger, never the JSON log.
+    """
+    sanitized_title = sanitize_filename(problem_data['title'])
+
+    cached = compile_cache.get(solution) if compile_cache is not None else None
+    if cached is not None:
+        # The model produced the same code as an earlier shot, so reuse the
+        # already-written source and compiled binary.
+        logger.log('info', f"Shot {shot} produced an identical solution, reusing compiled artifacts")
+        return cached
+
+    classpath = None
+    if isinstance(judge, JavaJudge):
+        try:
+            class_name = judge.get_class_name(solution)
+            # Java filenames are dictated by the class name, and overlapping
+            # compiles would collide on common names like Main, so each shot
+            # compiles into its own subdirectory.
+            classpath = os.path.join(temp_dir, f"{sanitized_title}_shot_{shot}")
+            os.makedirs(classpath, exist_ok=True)
+            source_file = os.path.join(classpath, f"{class_name}.java")
+            binary_file = os.path.join(classpath, f"{class_name}.class")
+        except ValueError as e:
+            logger.log('error', str(e))
+            return {"source_file": None, "binary_file": None, "class_name": None,
+                    "classpath": None, "compile_success": False, "error": str(e)}
+    else:
+        class_name = None
+        source_file = os.path.join(temp_dir, f"{sanitized_title}_shot_{shot}.{judge.language_extension}")
+        binary_file = os.path.join(temp_dir, f"{sanitized_title}_binary_shot_{shot}")
+
+    write_file_fast(source_file, solution)
+
+    if isinstance(judge, PythonJudge):
+        compile_success = True
+    else:
+        compile_success = judge.compile_code(source_file, binary_file)
+
+    artifacts = {
+        "source_file": source_file,
+        "binary_file": binary_file,
+        "class_name": class_name,
+        "classpath": classpath,
+        "compile_success": compile_success,
+    }
+    if compile_cache is not None:
+        compile_cache[solution] = artifacts
+    return artifacts
+
+def run_one_shot(judge, problem_data: dict, problem: Problem, solution: str, artifacts: dict, shot: int, ignore_time_limits: bool, json_logger: JSONLogger, logger: Logger, problems_passed: int, total_filtered_problems: int, index: int, test_case_workers: int = 1) -> tuple[int, bool]:
+    source_file = artifacts["source_file"]
+    binary_file = artifacts["binary_file"]
+    class_name = artifacts["class_name"]
+    if isinstance(judge, JavaJudge) and artifacts.get("classpath"):
+        # Safe to mutate here: run_one_shot is serialized behind the run lock.
+        judge.workdir = artifacts["classpath"]
+
+    if artifacts["compile_success"]:
+        def run_test_case(test_case):
+            input_data = test_case.input
             if isinstance(judge, PythonJudge):
-                compile_success = True
+                result = judge.run_code(source_file, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
+            elif isinstance(judge, JavaJudge):
+                result = judge.run_code(class_name, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
             else:
-                compile_success = judge.compile_code(source_file, binary_file)
+                result = judge.run_code(binary_file, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
 
-            if compile_success:
-                try:
-                    problem = Problem(**problem_data)
-                    results = []
-                    for test_case in problem.test_cases:
-                        input_data = test_case.input
-                        if isinstance(judge, PythonJudge):
-                            result = judge.run_code(source_file, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
-                        elif isinstance(judge, JavaJudge):
-                            result = judge.run_code(class_name, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
-                        else:
-                            result = judge.run_code(binary_file, input_data, problem.time_limit, problem.memory_limit, ignore_time_limits)
-                        
-                        result['pass'] = judge.validate_output(result['output'], test_case.output)
-                        result['log'] = result.get('error', '') or ('Passed' if result['pass'] else 'Failed')
-                        results.append(result)
-
-                    summary = generate_summary(results)
-                    logger.log('info', f"Problem {index + 1}/{total_filtered_problems} Shot {shot}: {summary}")
-                    if all(result['pass'] for result in results):
-                        problems_passed += 1
-                        json_logger.log_problem(problem.title, problem.category or "Uncategorized", results, solution, problems_passed, {"shot": shot, "status": "passed"})
-                        break
-                    else:
-                        json_logger.log_problem(problem.title, problem.category or "Uncategorized", results, solution, problems_passed, {"shot": shot, "status": "failed"})
-                except ValidationError as e:
-                    logger.log('error', f"Problem validation error: {e}")
-            else:
-                logger.log('error', "Compilation failed")
-                json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), solution, "Compilation failed", problems_passed, shot)
+            result['pass'] = judge.validate_output(result['output'], test_case.output)
+            result['log'] = result.get('error', '') or ('Passed' if result['pass'] else 'Failed')
+            return result
+
+        # The judges enforce time limits by wall clock, so never run more
+        # subprocesses than there are cores or the contention itself produces
+        # spurious TLE verdicts.
+        workers = min(test_case_workers, os.cpu_count() or 1, len(problem.test_cases))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(run_test_case, problem.test_cases))
         else:
+            results = [run_test_case(test_case) for test_case in problem.test_cases]
+
+        summary = generate_summary(results)
+        logger.log('info', f"Problem {index + 1}/{total_filtered_problems} Shot {shot}: {summary}")
+        if all(result['pass'] for result in results):
+            problems_passed += 1
+            json_logger.log_problem(problem.title, problem.category or "Uncategorized", results, solution, problems_passed, {"shot": shot, "status": "passed"})
+            return problems_passed, True
+        else:
+            json_logger.log_problem(problem.title, problem.category or "Uncategorized", results, solution, problems_passed, {"shot": shot, "status": "failed"})
+    else:
+        error_message = artifacts.get("error", "Compilation failed")
+        logger.log('error', "Compilation failed")
+        json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), solution, error_message, problems_passed, shot)
+
+    return problems_passed, False
+
+async def process_problem_async(judge, provider, problem_data: dict, shots: int, ignore_time_limits: bool, json_logger: JSONLogger, logger: Logger, counters: dict, total_filtered_problems: int, index: int, semaphore: asyncio.Semaphore, run_lock: asyncio.Lock, test_case_workers: int = 1, temp_dir: str = "temp"):
+    try:
+        problem = validate_problem(problem_data)
+    except ValidationError as e:
+        logger.log('error', f"Problem validation error: {e}")
+        return
+
+    compile_cache = {}
+    for shot in range(1, shots + 1):
+        async with semaphore:
+            solution = await provider.generate_solution_async(problem_data)
+
+        if not solution:
             logger.log('error', "Solution generation failed")
-            json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), "No solution generated", "Solution generation failed", problems_passed, shot)
+            # The JSON log is not thread-safe, so even this event-loop-side
+            # write has to wait out any run_one_shot thread holding the lock.
+            async with run_lock:
+                json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), "No solution generated", "Solution generation failed", counters["passed"], shot)
+            continue
 
-    return problems_passed
+        # Compile outside the run lock so compilation of one solution overlaps
+        # with another worker's test runs.
+        artifacts = await asyncio.to_thread(
+            prepare_one_shot, judge, problem_data, solution, shot, logger, compile_cache, temp_dir)
 
-def main():
+        # Test runs use subprocesses and RUSAGE_CHILDREN accounting, so only
+        # one solution is run at a time while other workers keep generating
+        # and compiling.
+        async with run_lock:
+            counters["passed"], shot_passed = await asyncio.to_thread(
+                run_one_shot, judge, problem_data, problem, solution, artifacts, shot, ignore_time_limits,
+                json_logger, logger, counters["passed"], total_filtered_problems, index, test_case_workers)
+        if shot_passed:
+            break
+
+async def process_problems_batch(judge, provider, todo: list[dict], shots: int, ignore_time_limits: bool, json_logger: JSONLogger, logger: Logger, counters: dict, total_filtered_problems: int, test_case_workers: int = 1, temp_dir: str = "temp", poll_interval: int = 30):
+    from providers.batch import BatchProvider
+
+    batch_provider = BatchProvider(provider, logger, temp_dir)
+    batch_id = await asyncio.to_thread(batch_provider.submit_batch, todo, shots)
+    logger.log('info', f"Submitted batch {batch_id}, polling every {poll_interval}s")
+
+    while True:
+        status = await asyncio.to_thread(batch_provider.poll, batch_id)
+        if status == "completed":
+            break
+        if status in ("failed", "expired", "cancelled", "canceled", "errored"):
+            logger.log('error', f"Batch {batch_id} finished with status {status}")
+            raise RuntimeError(f"Batch {batch_id} finished with status {status}")
+        await asyncio.sleep(poll_interval)
+
+    solutions = await asyncio.to_thread(batch_provider.fetch_results, batch_id)
+
+    for index, problem_data in enumerate(tqdm(todo, desc="Judging batch results")):
+        logger.log('info', f"Judging problem: {problem_data['title']}")
+        try:
+            problem = validate_problem(problem_data)
+        except ValidationError as e:
+            logger.log('error', f"Problem validation error: {e}")
+            continue
+        compile_cache = {}
+        for shot in range(1, shots + 1):
+            solution = solutions.get(f"{sanitize_filename(problem_data['title'])}_shot_{shot}")
+            if not solution:
+                logger.log('error', "Solution generation failed")
+                json_logger.log_compilation_error(problem_data["title"], problem_data.get("category", "Uncategorized"), "No solution generated", "Solution generation failed", counters["passed"], shot)
+                continue
+            artifacts = await asyncio.to_thread(
+                prepare_one_shot, judge, problem_data, solution, shot, logger, compile_cache, temp_dir)
+            counters["passed"], shot_passed = await asyncio.to_thread(
+                run_one_shot, judge, problem_data, problem, solution, artifacts, shot, ignore_time_limits,
+                json_logger, logger, counters["passed"], total_filtered_problems, index, test_case_workers)
+            if shot_passed:
+                break
+
+async def main_async():
     logger = Logger()
     config = load_config('config.json')
 
     os.makedirs("benchmark", exist_ok=True)
-    os.makedirs("temp", exist_ok=True)
+    temp_dir = make_temp_dir()
 
     log_filename = os.path.join("benchmark", f"{sanitize_filename(config.provider)}_{sanitize_filename(config.model)}_{sanitize_filename(config.language)}_log.json")
 
@@ -149,31 +294,52 @@ def main():
     shots = config.shots
     ignore_time_limits = config.ignore_time_limits
 
-    judge = initialize_judge(config.language, logger)
+    judge = initialize_judge(config.language, logger, temp_dir)
     provider = initialize_provider(config, logger)
 
-    if categories_filter:
-        filtered_problems = [problem for problem in problems if json.loads(problem).get("category") in categories_filter]
-    else:
-        filtered_problems = problems
-
-    total_filtered_problems = len(filtered_problems)
-    problems_passed = json_logger.data.get("total_passed_problems", 0)
+    counters = {"passed": json_logger.data.get("total_passed_problems", 0)}
     processed_titles = set(problem["title"] for problem in json_logger.data.get("problems", []))
 
-    for index, problem_str in enumerate(tqdm(filtered_problems, desc="Processing problems")):
-        problem_data = json.loads(problem_str)
-        problem_title = problem_data['title']
+    todo = [problem for problem in problems
+            if (not categories_filter or problem.get("category") in categories_filter)
+            and problem['title'] not in processed_titles]
+    total_filtered_problems = len(todo)
 
-        if problem_title in processed_titles:
-            logger.log('info', f"Skipping already processed problem: {problem_title}")
-            continue
+    # Flush the buffered log tail and drop the scratch dir even when a
+    # provider call, a failed batch or a worker exception aborts the run.
+    try:
+        if config.use_batch_api:
+            await process_problems_batch(judge, provider, todo, shots, ignore_time_limits, json_logger, logger, counters, total_filtered_problems, config.test_case_workers, temp_dir)
+            return
+
+        queue = asyncio.Queue()
+        for index, problem_data in enumerate(todo):
+            queue.put_nowait((index, problem_data))
+
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+        run_lock = asyncio.Lock()
+        progress = tqdm(total=total_filtered_problems, desc="Processing problems")
 
-        logger.log('info', f"Judging problem: {problem_title}")
-        problems_passed = process_problem(judge, provider, problem_data, shots, ignore_time_limits, json_logger, logger, problems_passed, total_filtered_problems, index)
+        async def worker():
+            while True:
+                try:
+                    index, problem_data = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                logger.log('info', f"Judging problem: {problem_data['title']}")
+                await process_problem_async(judge, provider, problem_data, shots, ignore_time_limits, json_logger, logger, counters, total_filtered_problems, index, semaphore, run_lock, config.test_case_workers, temp_dir)
+                progress.update(1)
+
+        workers = [asyncio.create_task(worker()) for _ in range(config.max_concurrency)]
+        await asyncio.gather(*workers)
+        progress.close()
+    finally:
+        json_logger.flush()
+        if os.path.exists(temp_dir):
+            remove_tree_fast(temp_dir)
 
-    if os.path.exists("temp"):
-        shutil.rmtree("temp")
+def main():
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
     main()
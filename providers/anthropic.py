@@ -9,29 +9,28 @@ class AnthropicProvider(BaseProvider):
         self.model = model
         self.base_prompt = base_prompt
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
+
+    def _build_content(self, problem: dict) -> list:
+        # cache_control marks the prompt as a cacheable prefix so retry shots
+        # of the same problem hit Anthropic's prompt cache. Prompts under the
+        # model's ~1024-token minimum are simply processed uncached.
+        return [{
+            "type": "text",
+            "text": self._build_prompt(problem),
+            "cache_control": {"type": "ephemeral"},
+        }]
 
     def generate_solution(self, problem: dict) -> str:
         self.logger.log('info', f"Generating solution using Anthropic model {self.model}")
 
-        prompt = (
-            f"{self.base_prompt}\n"
-            f"Problem Title: {problem['title']}\n"
-            f"Problem Statement: {problem['problem_statement']}\n"
-            f"Input: {problem['input']}\n"
-            f"Output: {problem['output']}\n"
-            f"Constraints: {problem['constraints']}\n"
-            f"Example Input: {problem['example']['input']}\n"
-            f"Example Output: {problem['example']['output']}\n"
-            f"\nProvide the solution in a markdown {self.language} block.\n"
-        )
-
         try:
             response = self.client.messages.create(
                 model=self.model,
                 max_tokens=1500,
                 temperature=0.7,
                 system="You are a helpful assistant.",
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": self._build_content(problem)}]
             )
 
             raw_solution = ''.join([block.text for block in response.content]).strip() # this is a little hacky TODO
@@ -46,3 +45,34 @@ class AnthropicProvider(BaseProvider):
             self.logger.log('error', f"API error: {e.status_code} - {e.response}")
 
         return None
+
+    async def generate_solution_async(self, problem: dict) -> str:
+        self.logger.log('info', f"Generating solution using Anthropic model {self.model}")
+
+        try:
+            chunks = []
+            async with self.async_client.messages.stream(
+                model=self.model,
+                max_tokens=1500,
+                temperature=0.7,
+                system="You are a helpful assistant.",
+                messages=[{"role": "user", "content": self._build_content(problem)}]
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+
+            raw_solution = ''.join(chunks).strip()
+            if not raw_solution:
+                self.logger.log('error', "Stream ended without any content")
+                return ""
+            self.logger.log('info', f"Generated raw solution: {raw_solution}")
+
+            return self.extract_code(raw_solution)
+        except anthropic.APIConnectionError as e:
+            self.logger.log('error', f"Connection error: {e}")
+        except anthropic.RateLimitError as e:
+            self.logger.log('error', f"Rate limit error: {e}")
+        except anthropic.APIStatusError as e:
+            self.logger.log('error', f"API error: {e.status_code} - {e.response}")
+
+        return None
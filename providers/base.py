@@ -1,16 +1,43 @@
 from abc import ABC, abstractmethod
 from utils.logger import Logger
+import asyncio
 import re
 
 class BaseProvider(ABC):
     def __init__(self, logger: Logger, language: str):
         self.logger = logger
         self.language = language
+        self._prompt_cache = {}
+
+    def _build_prompt(self, problem: dict) -> str:
+        # The prompt is identical for every shot of a problem, so build the
+        # concatenation once per title instead of per request.
+        title = problem['title']
+        prompt = self._prompt_cache.get(title)
+        if prompt is None:
+            prompt = (
+                f"{self.base_prompt}\n"
+                f"Problem Title: {problem['title']}\n"
+                f"Problem Statement: {problem['problem_statement']}\n"
+                f"Input: {problem['input']}\n"
+                f"Output: {problem['output']}\n"
+                f"Constraints: {problem['constraints']}\n"
+                f"Example Input: {problem['example']['input']}\n"
+                f"Example Output: {problem['example']['output']}\n"
+                f"\nProvide the solution in a markdown {self.language} block.\n"
+            )
+            self._prompt_cache[title] = prompt
+        return prompt
 
     @abstractmethod
     def generate_solution(self, problem_statement: str) -> str:
         pass
 
+    async def generate_solution_async(self, problem: dict) -> str:
+        # Fallback for providers without a native async client: run the
+        # blocking call in a thread so the event loop can keep going.
+        return await asyncio.to_thread(self.generate_solution, problem)
+
     def extract_code(self, raw_solution: str) -> str:
         code_block = f"```{self.language}"
         code_match = re.search(rf"{code_block}(.*?```)", raw_solution, re.DOTALL)
@@ -0,0 +1,113 @@
+import os
+from providers.base import BaseProvider
+from providers.openai import OpenAIProvider
+from providers.anthropic import AnthropicProvider
+from utils.logger import Logger
+from utils.utils import sanitize_filename, json_loads, json_dumps, write_file_fast
+
+class BatchProvider:
+    """Submits all problems as one Batch API job instead of per-problem calls.
+
+    Solutions are keyed by custom_id f"{sanitized_title}_shot_{shot}" so the
+    judge phase can look up the cached solution for every shot locally.
+    """
+
+    def __init__(self, provider: BaseProvider, logger: Logger, workdir: str = "temp"):
+        self.provider = provider
+        self.logger = logger
+        self.workdir = workdir
+        if not isinstance(provider, (OpenAIProvider, AnthropicProvider)):
+            logger.log('error', f"Batch API is not supported for provider {type(provider).__name__}")
+            raise ValueError("Batch API is not supported for this provider")
+
+    def submit_batch(self, problems: list[dict], shots: int) -> str:
+        self.logger.log('info', f"Submitting batch of {len(problems)} problems x {shots} shots")
+        if isinstance(self.provider, OpenAIProvider):
+            return self._submit_openai(problems, shots)
+        return self._submit_anthropic(problems, shots)
+
+    def poll(self, batch_id: str) -> str:
+        if isinstance(self.provider, OpenAIProvider):
+            return self.provider.client.batches.retrieve(batch_id).status
+        status = self.provider.client.messages.batches.retrieve(batch_id).processing_status
+        return "completed" if status == "ended" else status
+
+    def fetch_results(self, batch_id: str) -> dict:
+        if isinstance(self.provider, OpenAIProvider):
+            return self._fetch_openai(batch_id)
+        return self._fetch_anthropic(batch_id)
+
+    def _custom_id(self, problem: dict, shot: int) -> str:
+        return f"{sanitize_filename(problem['title'])}_shot_{shot}"
+
+    def _submit_openai(self, problems: list[dict], shots: int) -> str:
+        lines = []
+        for problem in problems:
+            for shot in range(1, shots + 1):
+                lines.append(json_dumps({
+                    "custom_id": self._custom_id(problem, shot),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.provider.model,
+                        "messages": self.provider._build_messages(problem),
+                        "temperature": 0.7,
+                        "max_tokens": 1500,
+                        "top_p": 1.0,
+                        "frequency_penalty": 0.0,
+                        "presence_penalty": 0.0,
+                        "prompt_cache_key": self.provider._cache_key(problem),
+                    },
+                }))
+
+        batch_input = os.path.join(self.workdir, "batch_input.jsonl")
+        write_file_fast(batch_input, "\n".join(lines))
+
+        with open(batch_input, 'rb') as file:
+            uploaded = self.provider.client.files.create(file=file, purpose="batch")
+        batch = self.provider.client.batches.create(input_file_id=uploaded.id, endpoint="/v1/chat/completions", completion_window="24h")
+        return batch.id
+
+    def _fetch_openai(self, batch_id: str) -> dict:
+        batch = self.provider.client.batches.retrieve(batch_id)
+        content = self.provider.client.files.content(batch.output_file_id).text
+        solutions = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            entry = json_loads(line)
+            body = (entry.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                raw_solution = choices[0]["message"]["content"].strip()
+                solutions[entry["custom_id"]] = self.provider.extract_code(raw_solution)
+            else:
+                self.logger.log('error', f"No completion in batch result for {entry.get('custom_id')}")
+        return solutions
+
+    def _submit_anthropic(self, problems: list[dict], shots: int) -> str:
+        requests = []
+        for problem in problems:
+            for shot in range(1, shots + 1):
+                requests.append({
+                    "custom_id": self._custom_id(problem, shot),
+                    "params": {
+                        "model": self.provider.model,
+                        "max_tokens": 1500,
+                        "temperature": 0.7,
+                        "system": "You are a helpful assistant.",
+                        "messages": [{"role": "user", "content": self.provider._build_content(problem)}],
+                    },
+                })
+        batch = self.provider.client.messages.batches.create(requests=requests)
+        return batch.id
+
+    def _fetch_anthropic(self, batch_id: str) -> dict:
+        solutions = {}
+        for entry in self.provider.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                raw_solution = ''.join([block.text for block in entry.result.message.content]).strip()
+                solutions[entry.custom_id] = self.provider.extract_code(raw_solution)
+            else:
+                self.logger.log('error', f"Batch request {entry.custom_id} failed: {entry.result.type}")
+        return solutions
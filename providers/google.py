@@ -14,24 +14,29 @@ class GoogleProvider(BaseProvider):
     def generate_solution(self, problem: dict) -> str:
         self.logger.log('info', f"Generating solution using Google Gemini model {self.model}")
 
-        prompt = (
-            f"{self.base_prompt}\n"
-            f"Problem Title: {problem['title']}\n"
-            f"Problem Statement: {problem['problem_statement']}\n"
-            f"Input: {problem['input']}\n"
-            f"Output: {problem['output']}\n"
-            f"Constraints: {problem['constraints']}\n"
-            f"Example Input: {problem['example']['input']}\n"
-            f"Example Output: {problem['example']['output']}\n"
-            f"\nProvide the solution in a markdown {self.language} block.\n"
-        )
-
-        response = self.client.generate_content(prompt)
+        response = self.client.generate_content(self._build_prompt(problem))
         raw_solution = response.text.strip()
         self.logger.log('info', f"Generated raw solution: {raw_solution}")
 
         return self.extract_code(raw_solution)
 
+    async def generate_solution_async(self, problem: dict) -> str:
+        self.logger.log('info', f"Generating solution using Google Gemini model {self.model}")
+
+        response = await self.client.generate_content_async(self._build_prompt(problem), stream=True)
+        chunks = []
+        async for chunk in response:
+            if chunk.text:
+                chunks.append(chunk.text)
+
+        raw_solution = ''.join(chunks).strip()
+        if not raw_solution:
+            self.logger.log('error', "Stream ended without any content")
+            return ""
+        self.logger.log('info', f"Generated raw solution: {raw_solution}")
+
+        return self.extract_code(raw_solution)
+
     def extract_code(self, raw_solution: str) -> str:
         code_match = re.search(rf"```{self.language}(.*?)```", raw_solution, re.DOTALL)
         if code_match:
@@ -13,19 +13,7 @@ class HuggingFaceProvider(BaseProvider):
     def generate_solution(self, problem: dict) -> str:
         self.logger.log('info', f"Generating solution using HuggingFace model {self.model}")
 
-        prompt = (
-            f"{self.base_prompt}\n"
-            f"Problem Title: {problem['title']}\n"
-            f"Problem Statement: {problem['problem_statement']}\n"
-            f"Input: {problem['input']}\n"
-            f"Output: {problem['output']}\n"
-            f"Constraints: {problem['constraints']}\n"
-            f"Example Input: {problem['example']['input']}\n"
-            f"Example Output: {problem['example']['output']}\n"
-            f"\nProvide the solution in a markdown {self.language} block.\n"
-        )
-
-        response = self.generator(prompt, max_length=1500, num_return_sequences=1)
+        response = self.generator(self._build_prompt(problem), max_length=1500, num_return_sequences=1)
         raw_solution = response[0]['generated_text'].strip()
         self.logger.log('info', f"Generated raw solution: {raw_solution}")
 
@@ -1,44 +1,70 @@
 import openai
 from providers.base import BaseProvider
 from utils.logger import Logger
+from utils.utils import sanitize_filename
 
 class OpenAIProvider(BaseProvider):
     def __init__(self, api_key: str, model: str, base_prompt: str, logger: Logger, language: str):
         super().__init__(logger, language)
-        openai.api_key = api_key
+        # One client per flavor so the underlying httpx connection pool is
+        # reused across all requests instead of re-handshaking per call.
+        self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key)
         self.model = model
         self.base_prompt = base_prompt
 
+    def _cache_key(self, problem: dict) -> str:
+        # Retry shots resend the identical prompt; a per-problem cache key
+        # routes them to the same prompt-cache shard for reliable hits.
+        return sanitize_filename(problem['title'])
+
+    def _build_messages(self, problem: dict) -> list:
+        return [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": self._build_prompt(problem)}
+        ]
+
     def generate_solution(self, problem: dict) -> str:
         self.logger.log('info', f"Generating solution using OpenAI model {self.model}")
 
-        prompt = (
-            f"{self.base_prompt}\n"
-            f"Problem Title: {problem['title']}\n"
-            f"Problem Statement: {problem['problem_statement']}\n"
-            f"Input: {problem['input']}\n"
-            f"Output: {problem['output']}\n"
-            f"Constraints: {problem['constraints']}\n"
-            f"Example Input: {problem['example']['input']}\n"
-            f"Example Output: {problem['example']['output']}\n"
-            f"\nProvide the solution in a markdown {self.language} block.\n"
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(problem),
+            temperature=0.7,
+            max_tokens=1500,
+            top_p=1.0,
+            frequency_penalty=0.0,
+            presence_penalty=0.0,
+            prompt_cache_key=self._cache_key(problem),
         )
+        raw_solution = response.choices[0].message.content.strip()
+        self.logger.log('info', f"Generated raw solution: {raw_solution}")
 
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ]
-        
-        response = openai.chat.completions.create(
+        return self.extract_code(raw_solution)
+
+    async def generate_solution_async(self, problem: dict) -> str:
+        self.logger.log('info', f"Generating solution using OpenAI model {self.model}")
+
+        stream = await self.async_client.chat.completions.create(
             model=self.model,
-            messages=messages,
+            messages=self._build_messages(problem),
             temperature=0.7,
             max_tokens=1500,
             top_p=1.0,
             frequency_penalty=0.0,
             presence_penalty=0.0,
+            prompt_cache_key=self._cache_key(problem),
+            stream=True,
         )
-        raw_solution = response.choices[0].message.content.strip()
+        chunks = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
+
+        raw_solution = ''.join(chunks).strip()
+        if not raw_solution:
+            self.logger.log('error', "Stream ended without any content")
+            return ""
         self.logger.log('info', f"Generated raw solution: {raw_solution}")
 
         return self.extract_code(raw_solution)
@@ -1,6 +1,6 @@
 import logging
-import json
 import os
+from utils.utils import json_loads, json_dumps
 
 class Logger:
     def __init__(self, name="JudgeLogger", level=logging.INFO):
@@ -24,11 +24,13 @@ class Logger:
             self.logger.critical(message)
 
 class JSONLogger:
-    def __init__(self, filename):
+    def __init__(self, filename, flush_every: int = 10):
         self.filename = filename
+        self.flush_every = flush_every
+        self._pending_writes = 0
         if os.path.exists(self.filename):
             with open(self.filename, 'r') as file:
-                self.data = json.load(file)
+                self.data = json_loads(file.read())
         else:
             self.data = {
                 "problems": [],
@@ -44,7 +46,7 @@ class JSONLogger:
             "categories": config.categories,
             "shots": config.shots
         }
-        self._write_log()
+        self.flush()
 
     def log_problem(self, title, category, results, solution, total_problems_passed, shots_info):
         passed_count = sum(1 for result in results if result['pass'])
@@ -99,5 +101,14 @@ class JSONLogger:
         self._write_log()
 
     def _write_log(self):
+        # Rewriting the whole log on every append is O(problems^2) over a
+        # run, so buffer appends and rewrite the file every flush_every
+        # entries. Call flush() before exiting to persist the tail.
+        self._pending_writes += 1
+        if self._pending_writes >= self.flush_every:
+            self.flush()
+
+    def flush(self):
         with open(self.filename, 'w') as file:
-            json.dump(self.data, file, indent=4)
+            file.write(json_dumps(self.data, indent=True))
+        self._pending_writes = 0
@@ -1,18 +1,21 @@
-from pydantic import BaseModel, validator
-from typing import List, Optional
+import msgspec
+from pydantic import BaseModel
+from typing import List, Optional, Union
 
-class Example(BaseModel):
+class Example(msgspec.Struct):
     input: str
     output: str
 
-class TestCase(BaseModel):
+class TestCase(msgspec.Struct):
     input: str
     output: str
 
-class Problem(BaseModel):
+class Problem(msgspec.Struct):
     title: str
-    time_limit: str
-    memory_limit: str
+    # The dataset supplies "1.00 s" / "512 MB" strings; __post_init__ rebinds
+    # them to int seconds / MB, which is the shape the judges consume.
+    time_limit: Union[str, int]
+    memory_limit: Union[str, int]
     problem_statement: str
     input: str
     output: str
@@ -21,17 +24,23 @@ class Problem(BaseModel):
     test_cases: List[TestCase]
     category: Optional[str] = None
 
-    @validator('time_limit')
-    def parse_time_limit(cls, v):
-        if v.endswith(" s"):
-            return int(float(v.replace(" s", "")))
-        raise ValueError("Invalid time limit format")
+    def __post_init__(self):
+        # Normalize the limits to ints; already-int values (e.g. re-converting
+        # a normalized record) pass through. msgspec surfaces the ValueErrors
+        # as ValidationError during convert().
+        if isinstance(self.time_limit, str):
+            if self.time_limit.endswith(" s"):
+                self.time_limit = int(float(self.time_limit.replace(" s", "")))
+            else:
+                raise ValueError("Invalid time limit format")
+        if isinstance(self.memory_limit, str):
+            if self.memory_limit.endswith(" MB"):
+                self.memory_limit = int(self.memory_limit.replace(" MB", ""))
+            else:
+                raise ValueError("Invalid memory limit format")
 
-    @validator('memory_limit')
-    def parse_memory_limit(cls, v):
-        if v.endswith(" MB"):
-            return int(v.replace(" MB", ""))
-        raise ValueError("Invalid memory limit format")
+def parse_problem(problem_data: dict) -> Problem:
+    return msgspec.convert(problem_data, Problem)
 
 class Config(BaseModel):
     ignore_time_limits: bool
@@ -41,5 +50,8 @@ class Config(BaseModel):
     base_prompt: str = "You are a helpful assistant."
     categories: Optional[List[str]] = None
     shots: int = 1
-    continue_from_log: Optional[str] = None 
+    continue_from_log: Optional[str] = None
     language: str = "cpp"
+    max_concurrency: int = 4
+    use_batch_api: bool = False
+    test_case_workers: int = 1
@@ -1,5 +1,50 @@
+import os
 import re
+import json
+from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=None)
 def sanitize_filename(name: str) -> str:
     sanitized = re.sub(r'[^a-zA-Z0-9_-]', '', name)
     return sanitized
+
+def write_file_fast(path: str, data: str):
+    # Single unbuffered write: skips the TextIOWrapper/BufferedWriter layers
+    # of open(). O_CLOEXEC keeps the fd out of the judge subprocesses spawned
+    # by other threads between open and close.
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data.encode())
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+def remove_tree_fast(path: str):
+    # Cleanup tuned for a flat scratch dir full of small files: one scandir
+    # pass per directory with batched unlinks, using the dirent type instead
+    # of the extra per-entry stat calls shutil.rmtree does.
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                remove_tree_fast(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent: bool = False) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)